@@ -2,19 +2,56 @@
 """
 
 import os
+import warnings
 
 mpiexec_active = (
     os.environ.get('OMPI_COMM_WORLD_SIZE', None) is not None or
     os.environ.get('MPIEXEC_TIMEOUT')
 )
 
+# Optional Open MPI collective tuning: with
+# ENSPARA_MPI_TUNE_COLLECTIVES=1, and fewer than 64 ranks, we request
+# binomial-tree bcast and Bruck allgather(v). These can help when
+# collectives are dominated by small messages (single frames, trajectory
+# lengths), but they are slow for large ones (e.g. the whole-array
+# broadcasts in assemble_striped_ragged_array), so this is off by default
+# and should only be enabled after measuring on the target cluster. These
+# are MCA parameters, which are only read when MPI is initialized (i.e.
+# on importing mpi4py, below). Values already set in the environment,
+# e.g. by a cluster's own tuning, take precedence. If the variable is set
+# but the tuning can't be applied (not launched by Open MPI's mpirun, or
+# too many ranks), we warn rather than silently ignoring it. See also
+# docs/source/installation.rst.
+_OPENMPI_COLLECTIVE_TUNING = {
+    'OMPI_MCA_coll_tuned_use_dynamic_rules': '1',
+    'OMPI_MCA_coll_tuned_bcast_algorithm': '6',  # binomial tree
+    'OMPI_MCA_coll_tuned_allgather_algorithm': '2',  # bruck
+    'OMPI_MCA_coll_tuned_allgatherv_algorithm': '2',  # bruck
+}
+
+if os.environ.get('ENSPARA_MPI_TUNE_COLLECTIVES', '0') == '1':
+    _ompi_world_size = os.environ.get('OMPI_COMM_WORLD_SIZE', None)
+    if _ompi_world_size is None:
+        warnings.warn(
+            "ENSPARA_MPI_TUNE_COLLECTIVES=1 is set, but this process "
+            "wasn't launched by Open MPI's mpirun/mpiexec (e.g. it was "
+            "launched by srun, or uses another MPI), so MPI collective "
+            "tuning was not applied.")
+    elif int(_ompi_world_size) >= 64:
+        warnings.warn(
+            "ENSPARA_MPI_TUNE_COLLECTIVES=1 is set, but MPI collective "
+            "tuning is only applied with fewer than 64 ranks (running "
+            "with %s), so it was not applied." % _ompi_world_size)
+    else:
+        for key, value in _OPENMPI_COLLECTIVE_TUNING.items():
+            os.environ.setdefault(key, value)
+
 try:
     from mpi4py import MPI as mpi4py
 except ImportError:  # ModuleNotFound error in python >=3.6
-    import warnings
     warnings.warn(
         "mpi4py isn't installed! If you want to use MPI-based "
-        "functionality, you'll need to install mpi4py ('pip install "
+        "functionality, you'll need to install mpi4py>=3.1 ('pip install "
         "mpi4py' and an MPI implementation (e.g. 'brew install mpich')")
 
     mpi4py_installed = False
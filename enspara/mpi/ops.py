@@ -9,6 +9,10 @@ from .. import mpi
 
 logger = logging.getLogger(__name__)
 
+# the per-frame arrays of an md.Trajectory sent by distribute_frame
+_TRAJECTORY_FRAME_FIELDS = (
+    'xyz', 'time', 'unitcell_lengths', 'unitcell_angles')
+
 
 def convert_local_indices(local_ctr_inds, global_lengths):
     """Convert indices from (rank, local_frame) to (global frame).
@@ -20,25 +24,37 @@ def convert_local_indices(local_ctr_inds, global_lengths):
 
     Parameters
     ----------
-    local_indices : iterable of tuples
-        A list of tuples of the form `(owner_rank, local_frame)`.
+    local_ctr_inds : iterable of tuples
+        An iterable of tuples of the form `(owner_rank, local_frame)`.
     global_lengths : np.ndarray
         Array of the length of each trajectory distributed across all
         the nodes.
+
+    Returns
+    -------
+    global_indices : np.ndarray, dtype=int
+        The global frame index of each of `local_ctr_inds`. Note that
+        this is an array, where older versions returned a list.
     """
 
     global_indexing = np.arange(np.sum(global_lengths))
     file_origin_ra = ra.RaggedArray(global_indexing, lengths=global_lengths)
 
-    ctr_inds = []
-    for rank, local_fid in local_ctr_inds:
-        global_fid = file_origin_ra[rank::mpi.size()].flatten()[local_fid]
-        ctr_inds.append(global_fid)
+    # the global indices of each rank's local frames are looked up once
+    # per rank, rather than once per converted index.
+    rank_frames = {}
+
+    local_ctr_inds = list(local_ctr_inds)
+    ctr_inds = np.empty(len(local_ctr_inds), dtype=int)
+    for i, (rank, local_fid) in enumerate(local_ctr_inds):
+        if rank not in rank_frames:
+            rank_frames[rank] = file_origin_ra[rank::mpi.size()].flatten()
+        ctr_inds[i] = rank_frames[rank][local_fid]
 
     return ctr_inds
 
 
-def assemble_striped_array(local_arr):
+def assemble_striped_array(local_arr, out=None):
     """Assemble an striped array.
 
     By 'striped array', we mean an array that has element i on node
@@ -50,6 +66,11 @@ def assemble_striped_array(local_arr):
     ----------
     local_array: np.ndarray
         The array to spread across nodes.
+    out : np.ndarray, default=None
+        Preallocated array to receive the assembled array into, for
+        callers that assemble repeatedly and want to reuse a buffer.
+        Must be C-contiguous and have the shape of the assembled array
+        and the dtype of `local_array`.
 
     Returns
     -------
@@ -57,25 +78,68 @@ def assemble_striped_array(local_arr):
         Full array that is striped across all nodes.
     """
 
-    if mpi.size() == 1:
+    if mpi.size() == 1 and out is None:
         return local_arr
 
-    total_dim1 = mpi.comm.allreduce(len(local_arr), op=mpi.mpi4py.SUM)
-    total_shape = (total_dim1,) + local_arr.shape[1:]
+    local_arr = np.ascontiguousarray(local_arr)
+    if mpi.size() == 1:
+        # one rank holds the whole array, so no collective is needed (and,
+        # without mpi4py, mpi.comm doesn't provide any)
+        local_lengths = np.array([len(local_arr)])
+    else:
+        local_lengths = np.array(mpi.comm.allgather(len(local_arr)))
+    total_shape = (local_lengths.sum(),) + local_arr.shape[1:]
+
+    if out is None:
+        out = np.empty(total_shape, dtype=local_arr.dtype)
+    elif (out.shape != total_shape or out.dtype != local_arr.dtype or
+          not out.flags.c_contiguous):
+        raise DataInvalid(
+            "In-place output array must be C-contiguous with shape %s and "
+            "dtype %s, got shape %s and dtype %s." %
+            (total_shape, local_arr.dtype, out.shape, out.dtype))
+
+    if mpi.size() == 1:
+        out[...] = local_arr
+        return out
 
     if not np.all(local_arr > 0):
         raise ImproperlyConfigured(
             ("On rank %s, a length <= 0 was found. Lengths must be "
              "strictly greater than zero.") % mpi.rank())
 
-    global_arr = np.zeros(total_shape, dtype=local_arr.dtype) - 1
+    # only reached with more than one rank, and therefore with mpi4py
+    from mpi4py.util.dtlib import from_numpy_dtype
 
-    for i in range(mpi.size()):
-        global_arr[i::mpi.size()] = mpi.comm.bcast(local_arr, root=i)
+    # each rank's rows land directly in their striped positions of `out`:
+    # rank r's rows are received as a vector with a stride of mpi.size()
+    # rows, starting r rows into `out`. Allgatherv takes a single receive
+    # type, so the per-rank layouts are expressed with Alltoallw, with
+    # every rank sending its whole local array to every other rank.
 
-    assert np.all(global_arr > 0), global_arr
+    row_size = int(np.prod(local_arr.shape[1:]))
+    row_bytes = row_size * local_arr.dtype.itemsize
+    base_type = from_numpy_dtype(local_arr.dtype)
 
-    return global_arr
+    recv_types = [
+        base_type.Create_vector(
+            int(length), row_size, mpi.size() * row_size).Commit()
+        for length in local_lengths]
+
+    try:
+        mpi.comm.Alltoallw(
+            [local_arr, ([local_arr.size] * mpi.size(), [0] * mpi.size()),
+             [base_type] * mpi.size()],
+            [out, ([1] * mpi.size(),
+                   [r * row_bytes for r in range(mpi.size())]),
+             recv_types])
+    finally:
+        for recv_type in recv_types:
+            recv_type.Free()
+
+    assert np.all(out > 0), out
+
+    return out
 
 
 def assemble_striped_ragged_array(local_array, global_lengths):
@@ -184,6 +248,13 @@ def distribute_frame(data, world_index, owner_rank):
     -------
     frame : array-like or md.Trajectory
         A single slice of `data`, of shape `data.shape[1:]`.
+
+    Notes
+    -----
+    Frames are copied into C-contiguous buffers before broadcasting.
+    A frame taken from a strided view of a larger array is not
+    contiguous, and sending it directly would require the MPI library
+    to pack and unpack a strided datatype.
     """
 
     if owner_rank >= mpi.size():
@@ -192,26 +263,37 @@ def distribute_frame(data, world_index, owner_rank):
             mpi.size(), owner_rank)
 
     if hasattr(data, 'xyz'):
+        # rather than pickling the whole trajectory, broadcast just its
+        # per-frame arrays and rebuild the trajectory on each node.
         if mpi.rank() == owner_rank:
-            frame = data[world_index].xyz
+            frame = data[world_index]
         else:
-            frame = np.empty_like(data[0].xyz)
+            frame = data[0]
+
+        fields = {}
+        for name in _TRAJECTORY_FRAME_FIELDS:
+            value = getattr(frame, name)
+            if value is not None:
+                if mpi.rank() == owner_rank:
+                    value = np.ascontiguousarray(value)
+                else:
+                    value = np.empty(value.shape, dtype=value.dtype)
+                mpi.comm.Bcast(value, root=owner_rank)
+            fields[name] = value
+
+        return type(data)(topology=data.top, **fields)
     else:
         if mpi.rank() == owner_rank:
-            frame = data[world_index]
+            frame = np.ascontiguousarray(data[world_index])
         else:
-            frame = np.empty_like(data[0])
+            frame = np.empty(data[0].shape, dtype=data.dtype)
 
-    mpi.comm.Bcast(frame, root=owner_rank)
+        mpi.comm.Bcast(frame, root=owner_rank)
 
-    if hasattr(data, 'xyz'):
-        wrapped_data = type(data)(xyz=frame, topology=data.top)
-        return wrapped_data
-    else:
         return frame
 
 
-def randind(local_array, random_state=None):
+def randind(local_array, random_state=None, size=None):
     """Given the local fragment of an assumed-larger array, give the
     location of a randomly chosen element of the array (uniformly
     distributed).
@@ -222,13 +304,20 @@ def randind(local_array, random_state=None):
         An array that's striped across multiple nodes in an MPI swarm.
     random_state : int or np.RandomState
         State of the RNG to use for the randomized part of the choice.
+    size : int, default=None
+        Number of elements to choose (with replacement). If None, a
+        single element is chosen. Drawing many elements in one call
+        requires only one round of communication, rather than one per
+        element.
 
     Returns
     -------
-    owner_rank : int
-        Rank of the node that owns the element that's chosen.
-    local_index : int
-        Index within the owner node's local array.
+    owner_rank : int or ndarray
+        Rank of the node that owns the element that's chosen. If `size`
+        is given, an array of length `size`.
+    local_index : int or ndarray
+        Index within the owner node's local array. If `size` is given,
+        an array of length `size`.
     """
 
     random_state = check_random_state(random_state)
@@ -242,15 +331,19 @@ def randind(local_array, random_state=None):
             "Random choice requires a non-empty array. Got shapes: %s" %
             n_states)
 
-    # Then, we select a random index from amongst the total lengths
+    # Then, we select random indices from amongst the total lengths on
+    # rank 0, and send all of them to every rank with a single
+    # buffer-based (rather than pickle-based) broadcast.
+    global_index = np.empty(1 if size is None else size, dtype=np.int64)
     if mpi.rank() == 0:
         # this is modeled after numpy.random.choice, but for some reason
         # our formulation here gives the samer results.
-        global_index = random_state.randint(sum(n_states))
-    else:
-        global_index = None
+        global_index[:] = random_state.randint(sum(n_states), size=size)
+
+    mpi.comm.Bcast(global_index, root=0)
 
-    global_index = mpi.comm.bcast(global_index, root=0)
+    if size is None:
+        global_index = global_index[0]
 
     # this computation is the same as finding global_index % mpi.size() and
     # global_index // mpi.size() iff our data are 'packed' on nodes, but not
@@ -258,14 +351,15 @@ def randind(local_array, random_state=None):
 
     concat = np.concatenate([np.arange(sum(n_states))[r::mpi.size()]
                              for r in range(mpi.size())])
-    a = ra.RaggedArray(
-        concat,
-        lengths=n_states,
-        error_checking=False)
 
-    owner_rank, local_index = ra.where(a == global_index)
-    owner_rank, local_index = owner_rank[0], local_index[0]
+    # position of each chosen index in the rank-by-rank concatenation
+    # of the local arrays, which we then split into (rank, offset)
+    position = np.argsort(concat)[global_index]
+    starts = np.cumsum(n_states) - n_states
+
+    owner_rank = np.searchsorted(starts, position, side='right') - 1
+    local_index = position - starts[owner_rank]
 
-    assert local_index >= 0
+    assert np.all(local_index >= 0)
 
     return (owner_rank, local_index)
@@ -1,6 +1,4 @@
-import collections
-import copy
-import itertools
+import collections.abc
 import logging
 import numbers
 import numpy as np
@@ -19,7 +17,7 @@ def zeros_like(array, *args, **kwargs):
 
     if hasattr(array, '_data'):
         flat_arr = np.zeros_like(array._data)
-        return RaggedArray(array=flat_arr, lengths=array.lengths)
+        return RaggedArray._from_trusted(flat_arr, array.lengths)
     else:
         return np.zeros_like(array)
 
@@ -162,8 +160,8 @@ def load(input_name, keys=..., stride=1):
 
             logger.debug('Loading keys %s into RA', keys)
 
-            shapes = [handle.get_node(where='/', name=k).shape
-                      for k in keys]
+            nodes = [handle.get_node(where='/', name=k) for k in keys]
+            shapes = [node.shape for node in nodes]
 
             if not all(len(shapes[0]) == len(shape) for shape in shapes):
                 raise DataInvalid(
@@ -178,19 +176,21 @@ def load(input_name, keys=..., stride=1):
                         " Dimension  %s didn't match. Got shapes: %s"
                         % (dim, shapes))
 
-            lengths = [(shape[0] + stride - 1) // stride for shape in shapes]
-            concat_shape = (sum(lengths),) + (shapes[0][1:])
+            lengths = np.array(
+                [(shape[0] + stride - 1) // stride for shape in shapes],
+                dtype=np.intp)
+            concat_shape = (lengths.sum(),) + (shapes[0][1:])
 
-            dtype = handle.get_node(where='/', name=keys[0]).dtype
-            if not all([dtype == handle.get_node(where='/', name=k).dtype
-                        for k in keys]):
+            dtype = nodes[0].dtype
+            if not all([dtype == node.dtype for node in nodes]):
                 raise DataInvalid(
                     "Can't load keys in %s because the keys didn't have all "
                     "the same dtype. Keys were: %s" % (dtype, keys))
 
             logger.debug('Allocating array of shape %s.', concat_shape)
             tick = time.perf_counter()
-            concat = np.zeros(concat_shape, dtype=dtype)
+            # every element is overwritten below, so don't zero it
+            concat = np.empty(concat_shape, dtype=dtype)
             tock = time.perf_counter()
             logger.debug('Allocated %.3f MB in %.2f min.',
                          concat.data.nbytes / 1024**2, tock - tick)
@@ -203,10 +203,11 @@ def load(input_name, keys=..., stride=1):
 
             tick = time.perf_counter()
             start = 0
-            for key in keys:
-                node = handle.get_node(where='/', name=key)[::stride]
-                end = start + len(node)
-                concat[start:end] = node
+            for node, length in zip(nodes, lengths):
+                end = start + length
+                # read straight into place, rather than into a temporary
+                # array that then has to be copied
+                node.read(step=stride, out=concat[start:end])
                 start = end
 
             tock = time.perf_counter()
@@ -228,18 +229,27 @@ def partition_indices(indices, traj_lengths):
     indices.
     '''
 
-    partitioned_indices = []
-    for index in indices:
-        trj_index = 0
-        for traj_len in traj_lengths:
-            if traj_len > index:
-                partitioned_indices.append((trj_index, index))
-                break
-            else:
-                index -= traj_len
-                trj_index += 1
+    indices = np.asarray(indices).reshape((-1,))
+    ends = np.cumsum(traj_lengths, dtype=int)
+
+    # indices past the end of the last trajectory have no 2d equivalent
+    indices = indices[indices < ends[-1]] if len(ends) else indices[:0]
+
+    # ends is monotonic, so a binary search finds each index's
+    # trajectory; side='right' skips over any zero-length trajectories
+    trj_indices = np.searchsorted(ends, indices, side='right')
+    local_indices = indices - (ends[trj_indices] -
+                               np.asarray(traj_lengths)[trj_indices])
+
+    return list(zip(trj_indices.tolist(), local_indices.tolist()))
+
 
-    return partitioned_indices
+def _lengths_to_starts(lengths):
+    """Compute the index in a concatenated array of the first element
+    of each row, given the length of each row."""
+    starts = np.zeros(len(lengths), dtype=int)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    return starts
 
 
 def _convert_from_1d(iis_flat, lengths=None, starts=None):
@@ -248,83 +258,68 @@ def _convert_from_1d(iis_flat, lengths=None, starts=None):
         raise ImproperlyConfigured(
             'No lengths or starts supplied')
     if starts is None:
-        starts = np.append([0], np.cumsum(lengths)[:-1])
-    iis_flat = iis_flat[0]
-    first_dimension = [
-        np.where(starts <= ii)[0][-1] for ii in iis_flat]
-    second_dimension = [
-        iis_flat[num]-starts[first_dimension[num]]
-        for num in range(len(iis_flat))]
-    return (np.array(first_dimension), np.array(second_dimension))
+        starts = _lengths_to_starts(lengths)
+    iis_flat = np.asarray(iis_flat[0])
+    # the row of each index is that of the last start at or before it
+    first_dimension = np.searchsorted(starts, iis_flat, side='right') - 1
+    second_dimension = iis_flat - starts[first_dimension]
+    return (first_dimension, second_dimension)
 
 
 def _handle_negative_indices(
         first_dimension, second_dimension, lengths=None, starts=None):
     """Given 2d indices as first_dimenion and second_dimension, converts
-       any negative index to a positive one."""
-    if type(first_dimension) is not np.ndarray:
-        first_dimension = np.array(first_dimension)
-    if type(second_dimension) is not np.ndarray:
-        second_dimension = np.array(second_dimension)
-    # remove negative indices from first dimension
-    first_dimension_neg_iis = np.where(first_dimension < 0)[0]
-    second_dimension_neg_iis = np.where(second_dimension < 0)[0]
-    if len(first_dimension_neg_iis) > 0:
-        if first_dimension.size > 1:
-            first_dimension[first_dimension_neg_iis] += len(starts)
-        else:
-            first_dimension += len(starts)
-        if len(np.where(first_dimension < 0)[0]) > 0:
-            # TODO: have clear error message here
-            raise IndexError()
-    # remove negative indices from second dimension
-    if len(second_dimension_neg_iis) > 0:
+       any negative index to a positive one. The inputs are not modified.
+    """
+    first_dimension = np.asarray(first_dimension)
+    second_dimension = np.asarray(second_dimension)
+    # one mask per dimension; np.where handles scalar (0d) and array
+    # indices alike and leaves the caller's arrays untouched
+    first_neg = first_dimension < 0
+    if first_neg.any():
+        first_dimension = np.where(
+            first_neg, first_dimension + len(starts), first_dimension)
+        if np.any(first_dimension < 0):
+            raise IndexError(
+                "Index out of bounds for axis 0 with size %s." % len(starts))
+    second_neg = second_dimension < 0
+    if second_neg.any():
         if lengths is None:
             raise ImproperlyConfigured(
                 'Must supply lengths if indices are negative.')
-        if second_dimension.size > 1:
-            if first_dimension.size > 1:
-                second_dimension[second_dimension_neg_iis] += lengths[
-                    first_dimension[second_dimension_neg_iis]]
-            else:
-                second_dimension[second_dimension_neg_iis] += lengths[
-                    first_dimension]
-        else:
-            second_dimension += lengths[first_dimension]
-        if len(np.where(second_dimension < 0)[0]) > 0:
-            # TODO: have clear error message here
-            raise IndexError()
+        second_dimension = np.where(
+            second_neg, second_dimension + lengths[first_dimension],
+            second_dimension)
+        if np.any(second_dimension < 0):
+            raise IndexError("Index out of bounds for axis 1.")
     return first_dimension, second_dimension
 
 
-def _convert_from_2d(iis_ragged, lengths=None, starts=None, error_check=True):
-    """Given indices in 2d, returns the corresponding 1d indices.
-       Requires either lengths or starts."""
-    if lengths is None and starts is None:
-        raise ImproperlyConfigured(
-            'No lengths or starts supplied')
-    if starts is None:
-        starts = np.append([0], np.cumsum(lengths)[:-1])
+def _convert_from_2d(iis_ragged, lengths, starts, error_check=True):
+    """Given indices in 2d, returns the corresponding 1d indices, using
+       the lengths and starts of the rows (e.g. a RaggedArray's cached
+       starts), neither of which is recomputed here."""
     first_dimension, second_dimension = iis_ragged
-    first_dimension = np.array(first_dimension)
-    second_dimension = np.array(second_dimension)
-    # Account for iis = ([0,1,2],4)
+    first_dimension = np.asarray(first_dimension)
+    second_dimension = np.asarray(second_dimension)
+    # Account for iis = ([0,1,2],4), without copying the 4
     if first_dimension.size > 1 and second_dimension.size == 1:
-        second_dimension = np.array(
-            [second_dimension for n in first_dimension])
+        second_dimension = np.broadcast_to(
+            second_dimension.reshape(()), first_dimension.shape)
     first_dimension, second_dimension = _handle_negative_indices(
         first_dimension, second_dimension, lengths=lengths, starts=starts)
     # Check for index error
-    if lengths is not None and error_check:
-        if np.any(lengths[first_dimension] <= second_dimension):
-            raise IndexError
+    if error_check:
+        if np.any(second_dimension >= lengths[first_dimension]):
+            raise IndexError("Index out of bounds for axis 1.")
     iis_flat = starts[first_dimension]+second_dimension
     return (iis_flat,)
 
 
 def _slice_to_list(slice_func, length=None):
-    """Converts a slice to a list. Requires the length of the array if
-       slicing to a negative index or there is no stopping criterion."""
+    """Converts a slice to an array of indices. Requires the length of
+       the array if slicing to a negative index or there is no stopping
+       criterion."""
     start = slice_func.start
     if start is None:
         start = 0
@@ -334,20 +329,17 @@ def _slice_to_list(slice_func, length=None):
                 'Must supply length of array if slicing to negative indices')
         start = length+start
     stop = slice_func.stop
-    if stop is None and length is None:
-        raise ImproperlyConfigured(
-            'Must supply length of array if stop is None')
     if stop is None:
+        if length is None:
+            raise ImproperlyConfigured(
+                'Must supply length of array if stop is None')
         stop = length
     elif stop < 0:
         stop = length+stop
     step = slice_func.step
     if step is None:
         step = 1
-    elif step < 0 and stop is None and start is None:
-        start = copy.copy(stop)
-        stop = -1
-    return range(start, stop, step)
+    return np.arange(start, stop, step, dtype=np.intp)
 
 
 def partition_list(list_to_partition, partition_lengths):
@@ -368,12 +360,18 @@ def partition_list(list_to_partition, partition_lengths):
     return partitioned_list
 
 
+# types that are always iterable, checked before the (slower) ABC
+_ITERABLE_TYPES = (list, tuple, np.ndarray)
+
+
 def _is_iterable(iterable):
     """Indicates if the input is iterable but not due to being a string or
        bytes. Returns a boolean value."""
-    iterable_bool = isinstance(iterable, collections.Iterable) and not \
-        isinstance(iterable, (str, bytes))
-    return iterable_bool
+    if isinstance(iterable, _ITERABLE_TYPES):
+        return True
+    if isinstance(iterable, (str, bytes)):
+        return False
+    return isinstance(iterable, collections.abc.Iterable)
 
 
 def _ensure_ragged_data(array):
@@ -393,10 +391,13 @@ def _ensure_ragged_data(array):
     return
 
 
-def _format__arrayline(_arrayline, operator):
+def _format__arrayline(_arrayline, operator, line_spacing):
     """Formats a single line of an array"""
-    formatted = getattr(_arrayline, operator)().split(')')[0].split('(')[-1]
-    return formatted
+    # numpy's own repr of a row is array([...], dtype=...), and its str
+    # doesn't indent continuation lines, so format the row directly
+    separator = ', ' if operator == '__repr__' else ' '
+    return line_spacing + np.array2string(
+        _arrayline, separator=separator, prefix=line_spacing)
 
 
 def _format_array(array, operator):
@@ -410,22 +411,18 @@ def _format_array(array, operator):
         header = '['
         aftermath = ']'
         line_spacing = ' '
-    body = []
-    # If the length of the array is greater than 6, generates an elipses
+    # If the length of the array is greater than 6, generates an elipses,
+    # and only the six rows around it are formatted
     if len(array) > 6:
-        for i in [0, 1, 2]:
-            body.append(
-                line_spacing+_format__arrayline(array[i], operator))
+        body = [_format__arrayline(array[i], operator, line_spacing)
+                for i in [0, 1, 2]]
         body.append(line_spacing+'...')
-        for i in [-3, -2, -1]:
-            body.append(
-                line_spacing+_format__arrayline(array[i], operator))
-        return "".join([header, ",\n".join(body), aftermath])
+        body.extend(_format__arrayline(array[i], operator, line_spacing)
+                    for i in [-3, -2, -1])
     else:
-        for i in range(len(array)):
-            body.append(
-                line_spacing+_format__arrayline(array[i], operator))
-        return "".join([header, ",\n".join(body), aftermath])
+        body = [_format__arrayline(row, operator, line_spacing)
+                for row in array]
+    return "".join([header, ",\n".join(body), aftermath])
 
 
 def _get_iis_from_slices(first_dimension_iis, second_dimension, lengths):
@@ -447,33 +444,63 @@ def _get_iis_from_slices(first_dimension_iis, second_dimension, lengths):
     else:
         stops = np.zeros(lengths.shape, dtype=int) + stop
     # if indices go past length, make it go upto length
-    iis_to_flat = np.where(stops > lengths)
-    stops[iis_to_flat] = lengths[iis_to_flat]
-    iis_2d = np.array(
-        [np.arange(start, stops[num], step) for num in first_dimension_iis])
-    iis_2d_lengths = np.array([len(i) for i in iis_2d])
-    iis_1d = np.array(
-        np.concatenate(
-            np.array(
-                [
-                    list(
-                        itertools.repeat(first_dimension_iis[i],
-                        iis_2d_lengths[i]))
-                    for i in range(len(iis_2d_lengths))])), dtype=int)
-    return (iis_1d, np.concatenate(iis_2d)), iis_2d_lengths
+    stops = np.minimum(stops, lengths)[first_dimension_iis]
+    # each row is np.arange(start, stop, step), which has this length
+    iis_2d_lengths = np.maximum(0, -((start - stops) // step))
+    iis_1d = np.repeat(first_dimension_iis, iis_2d_lengths)
+    # the k-th element of a row is start + k*step, so the concatenated
+    # second-dimension indices are one arithmetic expression
+    row_offsets = np.cumsum(iis_2d_lengths) - iis_2d_lengths
+    ks = np.arange(iis_2d_lengths.sum()) - np.repeat(
+        row_offsets, iis_2d_lengths)
+    iis_2d = start + step * ks
+    return (iis_1d, iis_2d), iis_2d_lengths
 
 
 def _get_iis_from_list(first_dimension, second_dimension):
     """Given the indices of the first dimension, the second dimension
     (as a list), and the lengths of the ragged dimension, returns the
     2D indices and the new lengths in the ragged dimension."""
-    iis = np.array(
-        list(itertools.product(first_dimension, second_dimension))).T
-    new_lengths = list(
-        itertools.repeat(len(second_dimension), len(first_dimension)))
+    first_dimension = np.asarray(first_dimension)
+    second_dimension = np.asarray(second_dimension)
+    # equivalent to the transpose of itertools.product(first, second)
+    iis = np.stack([
+        np.repeat(first_dimension, second_dimension.size),
+        np.tile(second_dimension, first_dimension.size)])
+    new_lengths = np.full(
+        first_dimension.size, second_dimension.size, dtype=np.intp)
     return iis, new_lengths
 
 
+# ufunc implementing each operator mapped over a RaggedArray's data, and
+# whether the operator is reflected (i.e. other is the left operand)
+_OPERATOR_UFUNCS = {
+    '__eq__': (np.equal, False),
+    '__lt__': (np.less, False),
+    '__le__': (np.less_equal, False),
+    '__gt__': (np.greater, False),
+    '__ge__': (np.greater_equal, False),
+    '__ne__': (np.not_equal, False),
+    '__add__': (np.add, False),
+    '__radd__': (np.add, True),
+    '__sub__': (np.subtract, False),
+    '__rsub__': (np.subtract, True),
+    '__mul__': (np.multiply, False),
+    '__rmul__': (np.multiply, True),
+    '__truediv__': (np.true_divide, False),
+    '__rtruediv__': (np.true_divide, True),
+    '__floordiv__': (np.floor_divide, False),
+    '__rfloordiv__': (np.floor_divide, True),
+    '__pow__': (np.power, False),
+    '__rpow__': (np.power, True),
+    '__mod__': (np.remainder, False),
+    '__rmod__': (np.remainder, True),
+    '__or__': (np.bitwise_or, False),
+    '__xor__': (np.bitwise_xor, False),
+    '__and__': (np.bitwise_and, False),
+}
+
+
 class RaggedArray(object):
     """RaggedArray class
 
@@ -483,10 +510,14 @@ class RaggedArray(object):
 
     Attributes
     ----------
-    _array : array, [n,]
-        The original input array.
+    _array : list, [n,]
+        The rows of the array, as views into _data.
     _data : array,
         The concatenated array.
+    _buf : array,
+        The storage backing _data, which is its first len(_data)
+        elements. It is overallocated by append, so that appending
+        repeatedly doesn't copy the whole array each time.
     lengths : array, [n]
         The length of each sub-array within _array
     starts : array, [n]
@@ -494,12 +525,16 @@ class RaggedArray(object):
         _array.
     """
 
-    __slots__ = ('_data', '_array', 'lengths')
+    __slots__ = ('_data', '_array', 'lengths', '_starts', '_buf', '_shape')
 
     def __init__(self, array, lengths=None, error_checking=True, copy=True):
+        # lists, tuples and arrays are used as-is; anything else (e.g.
+        # generators, pytables nodes) is materialized once, row by row
+        if not isinstance(array, (list, tuple, np.ndarray)):
+            array = list(array)
+
         # Check that input is proper (array of arrays)
         if error_checking:
-            array = np.array(list(array))
             if len(array) > 20000:
                 # lenghts is None => we are not inferring lengths from
                 # e.g. nested lists
@@ -525,18 +560,20 @@ class RaggedArray(object):
             logger.debug("Interpreting array as concatenated array.")
             self._data = np.array(array, copy=copy)
 
+        if len(array) > 0:
+            self._buf = self._data
+
         # Prepare with _array
         # new array greater with >0 elements
         if (lengths is None) and (len(array) > 0):
             # array of arrays
             if _is_iterable(array[0]):
                 self.lengths = np.array([len(i) for i in array], dtype=int)
-                self._array = np.array(
-                    partition_list(self._data, self.lengths), dtype='O')
+                self._array = partition_list(self._data, self.lengths)
             # array of single values
             else:
                 self.lengths = np.array([len(array)], dtype=int)
-                self._array = self._data.reshape((1, self.lengths[0]))
+                self._array = [self._data]
         # null array
         elif lengths is None:
             self.lengths = np.array([], dtype=int)
@@ -544,31 +581,66 @@ class RaggedArray(object):
         # rebuild array from 1d and lengths
         else:
             try:
-                self._array = np.array(
-                    partition_list(self._data, lengths), dtype='O')
+                self._array = partition_list(self._data, lengths)
             except DataInvalid:
                 raise DataInvalid(
                     "Sum of lengths (%s) didn't match data shape (%s)." %
                     (sum(lengths), self._data.shape))
             self.lengths = np.array(lengths)
 
+        # starts are a function of lengths alone, so they're computed once
+        # here and wherever lengths changes
+        self._starts = _lengths_to_starts(self.lengths)
+        self._shape = None
+
+    @classmethod
+    def _from_trusted(cls, data, lengths):
+        """Build a RaggedArray around concatenated data and the lengths of
+        its rows, which are trusted to be consistent. None of the checks
+        or conversions done by __init__ are performed, and data is not
+        copied.
+        """
+        ra = cls.__new__(cls)
+        ra._data = data
+        ra._buf = data
+        ra.lengths = np.array(lengths)
+        ra._starts = _lengths_to_starts(ra.lengths)
+        ra._array = partition_list(data, ra.lengths)
+        ra._shape = None
+        return ra
+
+    def __copy__(self):
+        # the copy views the same data as self, but append extends the
+        # row list and writes into _buf's spare capacity in place, so the
+        # copy gets its own row list and lengths, and a _buf without any
+        # spare capacity.
+        if not hasattr(self, '_data'):
+            return type(self)([])
+        return type(self)._from_trusted(self._data, self.lengths)
+
     @property
     def dtype(self):
         return self._data.dtype
 
     @property
     def shape(self):
-        if np.any(self.lengths-self.lengths[0]):
-            rag_second_dim = None
-        else:
-            rag_second_dim = self.lengths[0]
-        if _is_iterable(self._data[0]):
-            data_dim = self._data.shape
-            if len(data_dim) == 1:
-                return (len(self.lengths), rag_second_dim, None)
+        # computed lazily, and reset wherever lengths changes
+        if self._shape is None:
+            lengths = self.lengths
+            if len(lengths) and lengths.min() == lengths.max():
+                rag_second_dim = lengths[0]
             else:
-                return (len(self.lengths), rag_second_dim, self._data.shape[1])
-        return (len(self.lengths), rag_second_dim)
+                rag_second_dim = None
+            if self._data.ndim > 1:
+                self._shape = (
+                    len(lengths), rag_second_dim, self._data.shape[1])
+            elif self._data.dtype == object and len(self._data) and \
+                    _is_iterable(self._data[0]):
+                # rows of sequences with differing lengths
+                self._shape = (len(lengths), rag_second_dim, None)
+            else:
+                self._shape = (len(lengths), rag_second_dim)
+        return self._shape
 
     @property
     def size(self):
@@ -576,7 +648,7 @@ class RaggedArray(object):
 
     @property
     def starts(self):
-        return np.append([0], np.cumsum(self.lengths)[:-1])
+        return self._starts
 
     # Built in functions
     def __len__(self):
@@ -593,7 +665,9 @@ class RaggedArray(object):
             return self._array[iis]
         # slices and lists are handled by numpy, but return a RaggedArray
         elif isinstance(iis, (slice, list, np.ndarray)):
-            return RaggedArray(self._array[iis])
+            rows = self._select_rows(iis)
+            data = np.concatenate(rows) if len(rows) else self._data[:0]
+            return RaggedArray._from_trusted(data, self.lengths[iis])
         # tuples get index conversion from 2d to 1d
         elif isinstance(iis, tuple):
             first_dimension, second_dimension = iis
@@ -630,13 +704,13 @@ class RaggedArray(object):
             else:
                 return self._data[
                         _convert_from_2d(
-                            iis, lengths=self.lengths, starts=self.starts)]
+                            iis, lengths=self.lengths, starts=self._starts)]
             # Takes 2D indices generated from slicing in first or second
             #dimension and returns data formatted with new_lengths
             sliced_data = self._data[
                 _convert_from_2d(
-                    iis, lengths=self.lengths, starts=self.starts)]
-            return RaggedArray(sliced_data, lengths=new_lengths)
+                    iis, lengths=self.lengths, starts=self._starts)]
+            return RaggedArray._from_trusted(sliced_data, new_lengths)
 
         # if the indices are of self, assumes a boolean matrix. Converts
         # bool to indices and recalls __getitem__
@@ -649,8 +723,24 @@ class RaggedArray(object):
             value = value._array
         # ints, slices, lists, and numpy objects are handled by numpy
         if isinstance(iis, (numbers.Integral, slice, list, np.ndarray)):
-            self._array[iis] = value
-            self.__init__(self._array)
+            if not self._set_rows_inplace(iis, value):
+                if isinstance(iis, numbers.Integral):
+                    self._array[iis] = value
+                else:
+                    row_iis = self._row_indices(iis)
+                    # a single row is broadcast to every selected row,
+                    # as numpy does
+                    if _is_iterable(value) and len(value) == 1:
+                        value = list(value) * len(row_iis)
+                    if not _is_iterable(value) or \
+                            len(value) != len(row_iis):
+                        raise ValueError(
+                            "Can't assign %s rows to %s rows." %
+                            (len(value) if _is_iterable(value) else 1,
+                             len(row_iis)))
+                    for i, v in zip(row_iis, value):
+                        self._array[i] = v
+                self.__init__(self._array)
         # tuples get index conversion from 2d to 1d
         elif isinstance(iis, tuple):
             first_dimension, second_dimension = iis
@@ -676,7 +766,6 @@ class RaggedArray(object):
                 # a slice, numpy can handle it.
                 if isinstance(first_dimension, numbers.Integral):
                     self._array[first_dimension][second_dimension] = value
-                    self.__init__(self._array)
                     return
                 # if the second dimension is a slice, pick the maximum length
                 # of all arrays for conversion of slice to list. Indices that
@@ -689,7 +778,7 @@ class RaggedArray(object):
             # does regular conversion.
             else:
                 iis_1d = _convert_from_2d(
-                    iis, lengths=self.lengths, starts=self.starts)
+                    iis, lengths=self.lengths, starts=self._starts)
                 # concatenates values if necessary
                 if _is_iterable(value):
                     if _is_iterable(value[0]):
@@ -699,13 +788,11 @@ class RaggedArray(object):
                 else:
                     value_1d = value
                 self._data[iis_1d] = value_1d
-                self._array = np.array(
-                    partition_list(self._data, self.lengths), dtype='O')
                 return
             # Takes 2D indices generated from slicing in the first or second
             # dimension and sets data values to input values
             iis_1d = _convert_from_2d(
-                iis, lengths=self.lengths, starts=self.starts)
+                iis, lengths=self.lengths, starts=self._starts)
             if _is_iterable(value):
                 if _is_iterable(value[0]):
                     value_1d = np.concatenate(value)
@@ -713,18 +800,58 @@ class RaggedArray(object):
                     value_1d = value
             else:
                 value_1d = value
+            # rows of self._array are views into self._data, so they
+            # reflect this in-place assignment without being rebuilt
             self._data[iis_1d] = value_1d
-            self._array = np.array(
-                partition_list(self._data, self.lengths), dtype='O')
         # if the indices are of self, assumes a boolean matrix. Converts
         # bool to indices and recalls __getitem__
         elif type(iis) is type(self):
             iis = where(iis)
             self.__setitem__(iis, value)
 
+    def _row_indices(self, iis):
+        """Convert a slice, list or array (of ints or bools) selecting
+        rows into the positions of those rows."""
+        return np.arange(len(self._array))[iis]
+
+    def _select_rows(self, iis):
+        """The list of rows selected by a slice, list or array."""
+        if isinstance(iis, slice):
+            return self._array[iis]
+        return [self._array[i] for i in self._row_indices(iis)]
+
+    def _set_rows_inplace(self, iis, value):
+        """Write value into the rows selected by iis directly in
+        self._data, if doing so changes neither the lengths of the rows
+        nor the dtype of the array. Returns whether the write was done.
+        """
+        if isinstance(iis, numbers.Integral):
+            rows, value = [self._array[iis]], [value]
+        else:
+            rows = self._select_rows(iis)
+            if not _is_iterable(value) or len(value) != len(rows):
+                return False
+
+        value = [np.asarray(v) for v in value]
+        for row, v in zip(rows, value):
+            if v.shape != row.shape or \
+                    np.result_type(self._data, v) != self._data.dtype:
+                return False
+
+        # values that are themselves views into self._data (e.g. swapping
+        # rows, or assigning an array to a reversal of itself) could be
+        # overwritten by earlier rows' writes, so they're copied first
+        value = [v.copy() if np.may_share_memory(v, self._data) else v
+                 for v in value]
+
+        # rows are views into self._data, so this writes through to it
+        for row, v in zip(rows, value):
+            row[...] = v
+        return True
+
     def __invert__(self):
         new_data = self._data.__invert__()
-        return RaggedArray(new_data, lengths=self.lengths)
+        return RaggedArray._from_trusted(new_data, self.lengths)
 
     def __eq__(self, other):
         return self.map_operator('__eq__', other)
@@ -775,13 +902,18 @@ class RaggedArray(object):
     def map_operator(self, operator, other):
         if type(other) is type(self):
             other = other._data
-        new_data = getattr(self._data, operator)(other)
+        ufunc, reflected = _OPERATOR_UFUNCS[operator]
 
-        if new_data is NotImplemented:
+        try:
+            if reflected:
+                new_data = ufunc(other, self._data)
+            else:
+                new_data = ufunc(self._data, other)
+        except TypeError:
+            # as the ndarray operators do, let other try the operation
             return NotImplemented
-        else:
-            return RaggedArray(array=new_data, lengths=self.lengths,
-                               error_checking=False)
+
+        return RaggedArray._from_trusted(new_data, self.lengths)
 
     # Non-built in functions
     def all(self):
@@ -809,21 +941,44 @@ class RaggedArray(object):
         if len(self._data) == 0:
             self.__init__(values)
         else:
-            concat_values = np.concatenate(values)
-            self._data = np.append(self._data, concat_values)
             # if the values are a list of arrays, add them each individually
             if _is_iterable(values):
                 if _is_iterable(values[0]):
                     new_lengths = np.array([len(i) for i in values])
+                    concat_values = np.concatenate(values)
                 else:
                     new_lengths = [len(values)]
+                    concat_values = np.asarray(values)
             else:
                 raise DataInvalid(
                     'Expected an array of values or a ragged array')
+
+            size = len(self._data)
+            new_size = size + len(concat_values)
+            dtype = np.result_type(self._data, concat_values)
+
+            # grow the buffer geometrically, so that n appends copy O(n)
+            # elements in total rather than O(n^2)
+            regrow = new_size > len(self._buf) or dtype != self._buf.dtype
+            if regrow:
+                buf = np.empty(
+                    (max(2 * len(self._buf), new_size),) +
+                    self._data.shape[1:], dtype=dtype)
+                buf[:size] = self._data
+                self._buf = buf
+            self._buf[size:new_size] = concat_values
+            self._data = self._buf[:new_size]
+
             # update variables
             self.lengths = np.append(self.lengths, new_lengths)
-            self._array = np.array(
-                partition_list(self._data, self.lengths), dtype='O')
+            self._starts = _lengths_to_starts(self.lengths)
+            self._shape = None
+            if regrow:
+                self._array = partition_list(self._data, self.lengths)
+            else:
+                # existing rows still view the same buffer
+                self._array.extend(
+                    partition_list(self._buf[size:new_size], new_lengths))
 
     def flatten(self):
         return self._data.flatten()
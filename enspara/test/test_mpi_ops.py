@@ -10,6 +10,7 @@ from nose.plugins.attrib import attr
 from .util import get_fn
 from .. import exception
 from .. import mpi
+from ..cluster.util import ClusterResult
 
 
 @attr('mpi')
@@ -51,6 +52,16 @@ def test_mpi_distribute_frame_ndarray():
     assert_is(type(d), type(data))
 
 
+@attr('mpi')
+def test_mpi_distribute_frame_strided():
+
+    data = np.arange(10*100*3).reshape(10, 100, 3)[:, ::2]
+
+    d = mpi.ops.distribute_frame(data, 7, mpi.size()-1)
+
+    assert_array_equal(d, data[7])
+
+
 @attr('mpi')
 def test_mpi_distribute_frame_mdtraj():
 
@@ -59,6 +70,9 @@ def test_mpi_distribute_frame_mdtraj():
     d = mpi.ops.distribute_frame(data, 7, mpi.size()-1)
 
     assert_array_equal(d.xyz, data[7].xyz)
+    assert_array_equal(d.time, data[7].time)
+    assert_array_equal(d.unitcell_lengths, data[7].unitcell_lengths)
+    assert_array_equal(d.unitcell_angles, data[7].unitcell_angles)
     assert_is(type(d), type(data))
 
 
@@ -72,22 +86,74 @@ def test_mpi_assemble_striped_array():
     assert_array_equal(a, b)
 
 
+@attr('mpi')
+def test_mpi_assemble_striped_array_rows():
+
+    a = np.arange(77 * 3, dtype=float).reshape(77, 3) + 1
+
+    b = mpi.ops.assemble_striped_array(a[mpi.rank()::mpi.size()])
+
+    assert_array_equal(a, b)
+
+
+@attr('mpi')
+def test_mpi_assemble_striped_array_out():
+
+    a = np.arange(77) + 1
+    out = np.zeros_like(a)
+
+    b = mpi.ops.assemble_striped_array(a[mpi.rank()::mpi.size()], out=out)
+
+    assert_is(b, out)
+    assert_array_equal(a, out)
+
+    with assert_raises(exception.DataInvalid):
+        mpi.ops.assemble_striped_array(
+            a[mpi.rank()::mpi.size()], out=np.zeros(76, dtype=a.dtype))
+
+
 @attr('mpi')
 def test_mpi_randind():
 
     a = np.arange(17)
+    a_local = a[mpi.rank()::mpi.size()]
+    lengths = [len(a[r::mpi.size()]) for r in range(mpi.size())]
 
-    hits = []
+    ranks, offsets = mpi.ops.randind(a_local, size=100)
+    hits = mpi.ops.convert_local_indices(zip(ranks, offsets), lengths)
 
-    for i in range(100):
-        r, o = mpi.ops.randind(a[mpi.rank()::mpi.size()])
+    distro = np.bincount(hits)
+    assert_almost_equal(distro.mean(), len(hits)/len(a))
 
-        hits.append(mpi.ops.convert_local_indices(
-            [(r, o)],
-            [len(a[r::mpi.size()]) for r in range(mpi.size())])[0])
 
-    distro = np.bincount(hits)
-    assert_almost_equal(distro.mean(), (i+1)/len(a))
+@attr('mpi')
+def test_mpi_convert_local_indices_cluster_result():
+
+    # this mirrors how apps/cluster.py reassembles an MPI clustering
+    lengths = [5, 3, 4]
+    local_ctr_inds = [(0, 0), (mpi.size() - 1, 1), (0, 2)]
+
+    ctr_inds = mpi.ops.convert_local_indices(local_ctr_inds, lengths)
+    assert_equal(ctr_inds.dtype, int)
+
+    # trajectories are striped across ranks, and local frames index the
+    # concatenation of a rank's trajectories
+    starts = np.cumsum([0] + lengths[:-1])
+    rank_frames = [
+        np.concatenate([np.arange(s, s + l) for s, l in
+                        list(zip(starts, lengths))[r::mpi.size()]])
+        for r in range(mpi.size())]
+    expected = [rank_frames[r][f] for r, f in local_ctr_inds]
+    assert_array_equal(ctr_inds, expected)
+
+    result = ClusterResult(
+        center_indices=ctr_inds,
+        distances=np.zeros(sum(lengths)),
+        assignments=np.zeros(sum(lengths), dtype=int),
+        centers=None).partition(lengths)
+
+    assert_equal(
+        [starts[t] + f for t, f in result.center_indices], expected)
 
 
 @attr('mpi')
@@ -134,21 +200,34 @@ def test_mpi_randind_same_as_np():
             a[r::mpi.size()][o])
 
 
+@attr('mpi')
+def test_mpi_randind_size_same_as_np():
+
+    a = np.arange(17)
+
+    for seed in range(10):
+        ranks, offsets = mpi.ops.randind(
+            a[mpi.rank()::mpi.size()],
+            random_state=seed, size=100)
+
+        assert_array_equal(
+            np.random.RandomState(seed).choice(a, size=100),
+            [a[r::mpi.size()][o] for r, o in zip(ranks, offsets)])
+
+
 @attr('mpi')
 def test_mpi_randind_uniform():
 
     a = np.arange(17)
+    a_local = a[mpi.rank()::mpi.size()]
+    lengths = [len(a[r::mpi.size()]) for r in range(mpi.size())]
 
-    hits = []
+    hits = np.empty(100, dtype=int)
 
-    for i in range(100):
-        r, o = mpi.ops.randind(
-            a[mpi.rank()::mpi.size()],
-            random_state=0)
+    for i in range(len(hits)):
+        r, o = mpi.ops.randind(a_local, random_state=0)
 
-        hits.append(mpi.ops.convert_local_indices(
-            [(r, o)],
-            [len(a[r::mpi.size()]) for r in range(mpi.size())])[0])
+        hits[i] = mpi.ops.convert_local_indices([(r, o)], lengths)[0]
 
     distro = np.bincount(hits)
     assert_equal(distro[np.argmax(distro)], i+1)
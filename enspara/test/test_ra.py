@@ -1,3 +1,4 @@
+import copy
 import unittest
 import logging
 import tempfile
@@ -35,6 +36,21 @@ class Test_RaggedArray(unittest.TestCase):
         assert_array_equal(a.starts, [0, 10])
         assert_array_equal(a._data, np.concatenate([range(10), range(20)]))
 
+    def test_RaggedArray_no_copy(self):
+        src = np.arange(50)
+
+        a = ra.RaggedArray(array=src, lengths=[25, 25], copy=False)
+        assert_true(np.shares_memory(a._data, src))
+
+        a = ra.RaggedArray(array=src, lengths=[25, 25])
+        assert_true(not np.shares_memory(a._data, src))
+
+    def test_RaggedArray_from_generator(self):
+        a = ra.RaggedArray(np.arange(n) for n in [3, 1, 2])
+
+        assert_array_equal(a.lengths, [3, 1, 2])
+        assert_array_equal(a._data, [0, 1, 2, 0, 0, 1])
+
     def test_RaggedArray_floats(self):
         a = ra.RaggedArray([[0.8, 1.0, 1.2],
                             [1.1, 1.0, 0.9, 0.8]])
@@ -61,6 +77,16 @@ class Test_RaggedArray(unittest.TestCase):
         a_irreg = ra.RaggedArray(src_irreg)
         assert_equals(a_irreg.shape, (2, None, None))
 
+        # shape follows changes to the lengths of rows
+        a = ra.RaggedArray([[1, 2], [3, 4]])
+        assert_equals(a.shape, (2, 2))
+        a.append([[5, 6]])
+        assert_equals(a.shape, (3, 2))
+        a.append([[7]])
+        assert_equals(a.shape, (4, None))
+        a[-1] = [7, 8]
+        assert_equals(a.shape, (4, 2))
+
     def test_RaggedArray_disk_roundtrip(self):
         src = np.array(range(55))
         a = ra.RaggedArray(array=src, lengths=[25, 30])
@@ -110,6 +136,17 @@ class Test_RaggedArray(unittest.TestCase):
 
         assert_ra_equal(a, b)
 
+    def test_RaggedArray_load_h5_arrays_with_stride(self):
+        src = np.arange(55 * 2).reshape(55, 2).astype(np.float32)
+        a = ra.RaggedArray(array=src, lengths=[25, 1, 29])
+
+        with tempfile.NamedTemporaryFile(suffix='.h5') as f:
+            io.saveh(f.name, key0=a[0], key1=a[1], key2=a[2])
+            b = ra.load(f.name, keys=['key0', 'key1', 'key2'], stride=4)
+
+        assert_ra_equal(a[:, ::4], b)
+        assert_equals(b.dtype, np.float32)
+
     def test_RaggedArray_load_specific_h5_arrays(self):
 
         src = np.array(range(55))
@@ -143,6 +180,28 @@ class Test_RaggedArray(unittest.TestCase):
             a[1, 30]
         with assert_raises(IndexError):
             a[1, -31]
+        with assert_raises(IndexError):
+            a[-3, 0]
+        with assert_raises(IndexError):
+            a[(np.array([-3, 0]), np.array([0, 0]))]
+        with assert_raises(IndexError):
+            a[(np.array([0, 1]), np.array([-1, -31]))]
+
+        assert_array_equal(
+            a[(np.array([-1, 0, -2]), np.array([-1, 3, -25]))],
+            [a[1, 29], a[0, 3], a[0, 0]])
+
+        # the caller's index arrays are left as they were
+        rows, cols = np.array([-1, 0]), np.array([-1, -2])
+        a[(rows, cols)]
+        assert_array_equal(rows, [-1, 0])
+        assert_array_equal(cols, [-1, -2])
+
+        # a single second index applies to every row
+        assert_array_equal(a[np.array([0, 1]), 3], [a[0, 3], a[1, 3]])
+        assert_array_equal(a[np.array([0, 1]), -1], [a[0, 24], a[1, 29]])
+        with assert_raises(IndexError):
+            a[np.array([0, 1]), 25]
 
         assert_equals(a[0, 0], a[0][0])
         assert_equals(a[0, 5], a[0][5])
@@ -257,6 +316,28 @@ class Test_RaggedArray(unittest.TestCase):
                np.array([3, -1, 4]))],
             src[(np.array([33, 59, 34]))])
 
+    def test_RaggedArray_derived_arrays(self):
+        src = np.array(range(60))
+        a = ra.RaggedArray(array=src, lengths=[10, 20, 30])
+
+        # selecting rows gives a new array with its own data
+        b = a[np.array([False, True, True])]
+        assert_ra_equal(b, ra.RaggedArray(array=src[10:], lengths=[20, 30]))
+        b[0, 0] = -1
+        assert_equals(a[1, 0], 10)
+
+        assert_ra_equal(a[[-1, 0]], ra.RaggedArray([src[30:], src[:10]]))
+        assert_ra_equal(a[np.array([2])], ra.RaggedArray([src[30:]]))
+        assert_array_equal(a[[]].lengths, [])
+        assert_equals(a[[]].size, 0)
+
+        c = 1 - a[1:, :5] * 2
+        assert_ra_equal(
+            c, ra.RaggedArray([1 - 2*np.arange(10, 15),
+                               1 - 2*np.arange(30, 35)]))
+        assert_array_equal(c.starts, [0, 5])
+        assert_array_equal(c[1], 1 - 2*np.arange(30, 35))
+
     def test_subragged_data_mapping(self):
         src = np.array(range(60))
         a = ra.RaggedArray(array=src, lengths=[10, 20, 30])
@@ -265,6 +346,20 @@ class Test_RaggedArray(unittest.TestCase):
         b[0] = -1
         assert_equals(a[1, 0], -1)
 
+    def test_subragged_data_mapping_equal_lengths(self):
+        a = ra.RaggedArray([[1, 2], [3, 4]])
+
+        b = a[1]
+        b[0] = -1
+        assert_equals(a[1, 0], -1)
+
+        a[0, 0] = 10
+        assert_equals(a[0][0], 10)
+
+        a[0] = [5, 6]
+        assert_array_equal(a._data, [5, 6, -1, 4])
+        assert_equals(a.dtype, a[0].dtype)
+
     def test_ra_bool_indexing(self):
         src = [range(10), range(15), range(10)]
         a = ra.RaggedArray(array=src)
@@ -317,6 +412,60 @@ class Test_RaggedArray(unittest.TestCase):
         assert_equals(a[0, 2], -2)
         assert_equals(a[0, -1], -1)
 
+    def test_RaggedArray_setting_rows_inplace(self):
+        a = ra.RaggedArray(array=np.arange(50), lengths=[20, 30])
+        data = a._data
+
+        # writes that keep row lengths and dtype don't reallocate
+        a[1] = np.arange(30)[::-1]
+        a[[0]] = [np.zeros(20, dtype=int)]
+        a[:] = ra.RaggedArray([np.ones(20, dtype=int), np.arange(30)])
+        assert_is(a._data, data)
+        assert_array_equal(a._data, np.concatenate([[1]*20, range(30)]))
+
+        # values that alias the array's own rows
+        a = ra.RaggedArray([[1, 2], [3, 4]])
+        a[[0, 1]] = [a[1], a[0]]
+        assert_array_equal(a._data, [3, 4, 1, 2])
+
+        b = ra.RaggedArray([[1, 2], [3, 4], [5, 6]])
+        b[::-1] = b
+        assert_array_equal(b._data, [5, 6, 3, 4, 1, 2])
+
+        # fancy and boolean row selections
+        a = ra.RaggedArray([[0], [1, 1], [2, 2, 2]])
+        a[np.array([True, False, True])] = [[5, 5], [6]]
+        assert_ra_equal(a, ra.RaggedArray([[5, 5], [1, 1], [6]]))
+        a[[-1, 0]] = [[7, 7, 7], [8]]
+        assert_ra_equal(a, ra.RaggedArray([[8], [1, 1], [7, 7, 7]]))
+        a[1:] = [[9], [9]]
+        assert_ra_equal(a, ra.RaggedArray([[8], [9], [9]]))
+
+        # a single row is broadcast across the selected rows
+        a[[0, 1]] = [[1, 2, 3]]
+        assert_ra_equal(a, ra.RaggedArray([[1, 2, 3], [1, 2, 3], [9]]))
+        a[1:] = [np.array([4, 4])]
+        assert_ra_equal(a, ra.RaggedArray([[1, 2, 3], [4, 4], [4, 4]]))
+        a[0] = [5]
+        a[1:] = [[6, 6]]
+        assert_ra_equal(a, ra.RaggedArray([[5], [6, 6], [6, 6]]))
+        a[1] = [7, 7]
+        assert_array_equal(a[2], [6, 6])
+        with assert_raises(ValueError):
+            a[[0, 1, 2]] = [[1], [2]]
+
+        a = ra.RaggedArray([np.ones(20, dtype=int), np.arange(30)])
+
+        # writes that change row lengths or dtype rebuild the array
+        a[0] = range(5)
+        assert_array_equal(a.lengths, [5, 30])
+        assert_array_equal(a.starts, [0, 5])
+        assert_array_equal(a[1, :3], [0, 1, 2])
+
+        a[0] = np.zeros(5) + 0.5
+        assert_equals(a.dtype, np.float64)
+        assert_array_equal(a[0], [0.5]*5)
+
     def test_ra_eq(self):
         src = [range(10), range(20), range(30)]
         a = ra.RaggedArray(array=src)
@@ -347,6 +496,13 @@ class Test_RaggedArray(unittest.TestCase):
             ra.where(a < 0),
             np.array([[], []],))
 
+    def test_ra_where_empty_rows(self):
+        a = ra.RaggedArray(array=np.arange(8), lengths=[3, 0, 5, 0])
+
+        assert_array_equal(
+            ra.where(a % 2 == 0),
+            (np.array([0, 0, 2, 2]), np.array([0, 2, 1, 3])))
+
     def test_ra_where_ndarray(self):
         '''ra.where should work on ndarrays, too'''
         a = np.array([range(5), range(4, -1, -1)])
@@ -355,6 +511,95 @@ class Test_RaggedArray(unittest.TestCase):
             ra.where(a == 4),
             [[0, 1], [4, 0]])
 
+    def test_ra_append(self):
+        a = ra.RaggedArray([[1, 2, 3], [4, 5]])
+
+        a.append([[6], [7, 8, 9]])
+        assert_ra_equal(a, ra.RaggedArray([[1, 2, 3], [4, 5], [6], [7, 8, 9]]))
+        assert_array_equal(a.starts, [0, 3, 5, 6])
+        assert_array_equal(a[3], [7, 8, 9])
+
+        a.append(ra.RaggedArray([[10, 11]]))
+        assert_array_equal(a.lengths, [3, 2, 1, 3, 2])
+        assert_array_equal(a.starts, [0, 3, 5, 6, 9])
+        assert_array_equal(a[-1], [10, 11])
+        assert_array_equal(a[2:, 1:]._data, [8, 9, 11])
+
+    def test_ra_append_many(self):
+        rows = [np.arange(n) for n in [4, 1, 0, 7, 3, 5, 2, 6]]
+
+        a = ra.RaggedArray(rows[:1])
+        for row in rows[1:]:
+            a.append([row])
+        assert_ra_equal(a, ra.RaggedArray(rows))
+        for i, row in enumerate(rows):
+            assert_array_equal(a[i], row)
+
+        # row views still map onto the data after appending
+        a[0, 0] = 100
+        assert_equals(a._data[0], 100)
+
+        # appending wider types upcasts, as np.append would
+        a.append([[0.5]])
+        assert_equals(a.dtype, np.float64)
+        assert_array_equal(a[-1], [0.5])
+        assert_array_equal(a[3], rows[3])
+
+    def test_ra_append_shallow_copy(self):
+        a = ra.RaggedArray([[1, 2], [3, 4, 5], [6]])
+        a.append([[100, 101]])
+
+        b = copy.copy(a)
+        b.append([[200, 201]])
+        assert_array_equal(a[-1], [100, 101])
+        assert_array_equal(a.lengths, [2, 3, 1, 2])
+        assert_equals(len(a), 4)
+        assert_array_equal(b[-1], [200, 201])
+        assert_equals(len(b), 5)
+
+        # appending to the original doesn't show up in the copy, either
+        a.append([[300]])
+        assert_array_equal(a[-1], [300])
+        assert_array_equal(b[-1], [200, 201])
+        assert_array_equal(b[-2], [100, 101])
+
+        assert_equals(len(copy.copy(ra.RaggedArray([]))), 0)
+
+    def test_ra_append_multidimensional(self):
+        a = ra.RaggedArray([np.zeros((2, 3)), np.ones((1, 3))])
+
+        a.append([np.ones((4, 3)) * 2])
+        assert_array_equal(a.lengths, [2, 1, 4])
+        assert_equals(a._data.shape, (7, 3))
+        assert_array_equal(a[2], np.ones((4, 3)) * 2)
+
+    def test_ra_repr_str(self):
+        a = ra.RaggedArray([np.arange(3, dtype=np.float32),
+                            np.arange(2, dtype=np.float32)])
+
+        assert_equals(
+            repr(a), 'RaggedArray([\n      [0., 1., 2.],\n      [0., 1.]])')
+        assert_equals(str(a), '[ [0. 1. 2.],\n [0. 1.]]')
+
+        a = ra.RaggedArray([np.arange(2)] * 8)
+        assert_equals(repr(a).count('...'), 1)
+        assert_equals(repr(a).count('[0, 1]'), 6)
+
+    def test_ra_reflected_operators(self):
+        src = [np.arange(1, 4), np.arange(4, 6)]
+        a = ra.RaggedArray(src)
+        flat = np.concatenate(src)
+
+        assert_ra_equal(2 - a, ra.RaggedArray(2 - flat, lengths=[3, 2]))
+        assert_ra_equal(12 / a, ra.RaggedArray(12 / flat, lengths=[3, 2]))
+        assert_ra_equal(12 // a, ra.RaggedArray(12 // flat, lengths=[3, 2]))
+        assert_ra_equal(2 ** a, ra.RaggedArray(2 ** flat, lengths=[3, 2]))
+        assert_ra_equal(7 % a, ra.RaggedArray(7 % flat, lengths=[3, 2]))
+        assert_ra_equal(a - a, ra.zeros_like(a))
+
+        with assert_raises(TypeError):
+            a + 'x'
+
     def test_ra_invert(self):
         a = ra.RaggedArray([[True, False, True, False],
                             [False, True, False]])
@@ -701,6 +946,26 @@ class TestPartition(unittest.TestCase):
             partit_indices,
             [(0, 0), (1, 0), (1, 5), (2, 7), (2, 70)])
 
+    def test_partition_indices_random(self):
+
+        random_state = np.random.RandomState(0)
+
+        for _ in range(20):
+            trj_lens = random_state.randint(0, 20, size=10)
+            indices = random_state.randint(0, trj_lens.sum() + 10, size=50)
+
+            # every index should map to a (trajectory, frame) pair that
+            # finds the same element of the concatenated array
+            starts = np.cumsum(trj_lens) - trj_lens
+
+            partit_indices = ra.partition_indices(indices, trj_lens)
+
+            self.assertEqual(
+                [starts[i] + j for i, j in partit_indices],
+                [ind for ind in indices if ind < trj_lens.sum()])
+            for i, j in partit_indices:
+                self.assertLess(j, trj_lens[i])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -4,8 +4,11 @@ import numpy as np
 import scipy.sparse
 
 from numpy.testing import assert_array_equal, assert_array_almost_equal
+from nose.tools import assert_raises
 
-from ..tpt import committors, reactive_fluxes, mfpts
+from ..exception import DataInvalid
+from ..tpt import committors, reactive_fluxes, net_fluxes, mfpts
+from ..tpt.tpt import _COMMITTOR_CACHE, _COMMITTOR_CACHE_SIZE
 
 
 ARR_TYPES = [
@@ -80,6 +83,8 @@ def test_fluxes():
         true_fluxes = np.around(true_fluxes, 5)
 
         calc_fluxes = reactive_fluxes(Tij, 0, 2, populations=pops)
+        assert scipy.sparse.issparse(calc_fluxes) == \
+            scipy.sparse.issparse(Tij)
         if hasattr(calc_fluxes, 'todense'):
             calc_fluxes = np.array(calc_fluxes.todense()).astype(np.double)
 
@@ -96,6 +101,119 @@ def test_fluxes():
         assert_array_equal(calc_fluxes, true_fluxes)
 
 
+def test_net_fluxes():
+    Tij_ndarray = np.array(
+        [
+            [0.5, 0.4, 0.1, 0.],
+            [0.25, 0.5, 0.2, 0.05],
+            [0.1, 0.15, 0.5, 0.25],
+            [0., 0.1, 0.4, 0.5]])
+
+    fluxes = reactive_fluxes(Tij_ndarray, 0, 3)
+    true_net_fluxes = fluxes - fluxes.T
+    true_net_fluxes[true_net_fluxes < 0] = 0
+
+    for arr_type in ARR_TYPES:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            Tij = arr_type(Tij_ndarray)
+
+        calc_net_fluxes = net_fluxes(Tij, 0, 3)
+        if hasattr(calc_net_fluxes, 'todense'):
+            calc_net_fluxes = np.array(calc_net_fluxes.todense())
+
+        assert_array_almost_equal(calc_net_fluxes, true_net_fluxes)
+
+
+def test_fluxes_precomputed_committors():
+    Tij = np.array(
+        [
+            [0.5, 0.4, 0.1, 0.],
+            [0.25, 0.5, 0.2, 0.05],
+            [0.1, 0.15, 0.5, 0.25],
+            [0., 0.1, 0.4, 0.5]])
+
+    for_committors = committors(Tij, 0, 3)
+
+    assert_array_equal(
+        reactive_fluxes(Tij, 0, 3),
+        reactive_fluxes(Tij, 0, 3, for_committors=for_committors))
+    assert_array_equal(
+        net_fluxes(Tij, 0, 3),
+        net_fluxes(Tij, 0, 3, for_committors=for_committors))
+
+    with assert_raises(DataInvalid):
+        reactive_fluxes(Tij, 0, 3, for_committors=for_committors[:-1])
+
+
+def test_fluxes_committor_cache():
+    Tij = np.array(
+        [
+            [0.5, 0.4, 0.1, 0.],
+            [0.25, 0.5, 0.2, 0.05],
+            [0.1, 0.15, 0.5, 0.25],
+            [0., 0.1, 0.4, 0.5]])
+
+    _COMMITTOR_CACHE.clear()
+
+    fluxes = reactive_fluxes(Tij, 0, 3)
+    assert len(_COMMITTOR_CACHE) == 1
+
+    # identical problems hit the cache, even for a copy of tprob
+    assert_array_equal(fluxes, reactive_fluxes(Tij.copy(), [0], [3]))
+    assert len(_COMMITTOR_CACHE) == 1
+
+    # modifying tprob in place must not return stale committors
+    Tij[1] = [0.05, 0.5, 0.2, 0.25]
+    assert_array_almost_equal(
+        reactive_fluxes(Tij, 0, 3),
+        reactive_fluxes(Tij, 0, 3, for_committors=committors(Tij, 0, 3)))
+    assert len(_COMMITTOR_CACHE) == 2
+
+    for i in range(_COMMITTOR_CACHE_SIZE + 1):
+        reactive_fluxes(Tij, 0, [3] * (i + 1))
+    assert len(_COMMITTOR_CACHE) == _COMMITTOR_CACHE_SIZE
+
+
+def test_fluxes_bad_populations():
+    Tij = np.array(
+        [
+            [0.5, 0.5, 0],
+            [0.5, 0, 0.5],
+            [0, 0.5, 0.5]])
+
+    with assert_raises(DataInvalid):
+        reactive_fluxes(Tij, 0, 2, populations=np.zeros(4) + 0.25)
+
+
+def test_fluxes_float32():
+    Tij = np.array(
+        [
+            [0.5, 0.5, 0],
+            [0.5, 0, 0.5],
+            [0, 0.5, 0.5]])
+    pops = np.zeros(3) + (1/3.)
+
+    true_fluxes = reactive_fluxes(Tij, 0, 2, populations=pops)
+
+    for arr_type in ARR_TYPES:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            Tij_32 = arr_type(Tij.astype(np.float32))
+
+        # single precision tprob gives single precision fluxes
+        calc_fluxes = reactive_fluxes(Tij_32, 0, 2, populations=pops)
+        assert calc_fluxes.dtype == np.float32
+        if hasattr(calc_fluxes, 'todense'):
+            calc_fluxes = np.array(calc_fluxes.todense())
+        assert_array_almost_equal(calc_fluxes, true_fluxes)
+
+    calc_fluxes = reactive_fluxes(
+        Tij, 0, 2, populations=pops, dtype=np.float32)
+    assert calc_fluxes.dtype == np.float32
+    assert_array_almost_equal(calc_fluxes, true_fluxes)
+
+
 def test_mfpts():
     tcounts = np.array([[2, 1, 1], [2, 1, 2], [3, 2, 1]])
     T_test = tcounts/tcounts.sum(axis=1)[:, None]
@@ -13,31 +13,101 @@ References
 """
 from __future__ import print_function, division, absolute_import
 
+import hashlib
+from collections import OrderedDict
+
 import numpy as np
 from scipy import sparse
 
 from . import committors
+from ..exception import DataInvalid, ImproperlyConfigured
+from .libtpt import _reactive_fluxes_dense, _net_fluxes_dense
 from ..msm.transition_matrices import eq_probs
 
 
 __all__ = ['reactive_fluxes', 'net_fluxes', 'reactive_populations']
 
+# most recently used forward committors, keyed by _committor_key
+_COMMITTOR_CACHE = OrderedDict()
+_COMMITTOR_CACHE_SIZE = 16
+
+
+def _committor_key(tprob, sources, sinks):
+    """Build a hashable key identifying the committor problem for
+    tprob, sources and sinks. tprob is identified by a digest of its
+    contents rather than its id, so that in-place modifications of a
+    transition matrix (or reuse of a freed object's id) never return
+    stale committors.
+    """
+
+    digest = hashlib.sha1()
+    if sparse.issparse(tprob):
+        # only canonicalize (into a copy, leaving the caller's matrix
+        # untouched) when tprob isn't already in canonical CSR form.
+        if not (sparse.isspmatrix_csr(tprob) and tprob.has_canonical_format):
+            tprob = sparse.csr_matrix(tprob, copy=True)
+            tprob.sum_duplicates()
+        for arr in (tprob.data, tprob.indices, tprob.indptr):
+            digest.update(np.ascontiguousarray(arr).data)
+    else:
+        tprob = np.asarray(tprob)
+        digest.update(np.ascontiguousarray(tprob).data)
+
+    return (digest.hexdigest(), tprob.shape, tprob.dtype.str,
+            sparse.issparse(tprob), tuple(sources.tolist()),
+            tuple(sinks.tolist()))
+
+
+def _cached_committors(tprob, sources, sinks):
+    """Forward committors for sources -> sinks, reusing the result of
+    a previous call on an identical problem if one is still cached.
+    """
+
+    key = _committor_key(tprob, sources, sinks)
+
+    try:
+        forward_committors = _COMMITTOR_CACHE[key]
+        _COMMITTOR_CACHE.move_to_end(key)
+    except KeyError:
+        forward_committors = committors(tprob, sources, sinks)
+        _COMMITTOR_CACHE[key] = forward_committors
+        if len(_COMMITTOR_CACHE) > _COMMITTOR_CACHE_SIZE:
+            _COMMITTOR_CACHE.popitem(last=False)
+
+    # callers own their result; the cached array must never be mutated
+    return forward_committors.copy()
 
-def _get_data_from_tprob(tprob, sources, sinks, populations):
+
+def _get_data_from_tprob(tprob, sources, sinks, populations,
+                         for_committors=None):
     """A helper function for parsing data and returning relevant
        parameters for TPT analysis
     """
 
-    sources = np.array(sources).reshape((-1,))
-    sinks = np.array(sinks).reshape((-1,))
+    sources = np.asarray(sources).reshape((-1,))
+    sinks = np.asarray(sinks).reshape((-1,))
     # check to see if populations exist
     if populations is None:
         populations = eq_probs(tprob)
+    else:
+        populations = np.asarray(populations)
+        if populations.shape != (tprob.shape[0],):
+            raise DataInvalid(
+                "Expected populations of shape (%s,) for a transition "
+                "matrix of shape %s, got shape %s." %
+                (tprob.shape[0], tprob.shape, populations.shape))
 
     n_states = len(populations)
 
     # check if committors exist
-    forward_committors = committors(tprob, sources, sinks)
+    if for_committors is None:
+        forward_committors = _cached_committors(tprob, sources, sinks)
+    else:
+        forward_committors = np.asarray(for_committors)
+        if forward_committors.shape != (n_states,):
+            raise DataInvalid(
+                "Expected committors of shape (%s,), got shape %s." %
+                (n_states, forward_committors.shape))
 
     # reverse committors if process is at equilibrium
     reverse_committors = 1 - forward_committors
@@ -45,7 +115,53 @@ def _get_data_from_tprob(tprob, sources, sinks, populations):
     return populations, n_states, forward_committors, reverse_committors
 
 
-def reactive_fluxes(tprob, sources, sinks, populations=None):
+def _flux_scaling(tprob, sources, sinks, populations, for_committors,
+                  dtype):
+    """Compute the vectors that scale the rows, pi_i * q-_i, and the
+    columns, q+_j, of tprob to give the reactive fluxes, as well as
+    the floating point type that fluxes should be computed in.
+    """
+
+    populations, n_states, forward_committors, reverse_committors = \
+        _get_data_from_tprob(
+            tprob, sources, sinks, populations, for_committors)
+
+    if dtype is None:
+        dtype = np.float32 if tprob.dtype == np.float32 else np.float64
+    elif np.dtype(dtype) not in (np.float32, np.float64):
+        raise ImproperlyConfigured(
+            "Fluxes can only be computed as np.float32 or np.float64, "
+            "got dtype %s." % np.dtype(dtype))
+
+    left = np.ascontiguousarray(
+        populations * reverse_committors, dtype=dtype)
+    right = np.ascontiguousarray(forward_committors, dtype=dtype)
+
+    return left, right, dtype
+
+
+def _sparse_reactive_fluxes(tprob, left, right, dtype):
+    """Reactive fluxes for a sparse tprob, as a CSR matrix.
+    """
+
+    fluxes = sparse.csr_matrix(tprob, dtype=dtype, copy=True)
+    fluxes.sum_duplicates()
+
+    # the rank-1 scaling left[i] * right[j] is only evaluated at the
+    # stored entries of tprob, in place on the CSR data
+    rows = np.repeat(np.arange(fluxes.shape[0]), np.diff(fluxes.indptr))
+    fluxes.data *= left[rows]
+    fluxes.data *= right[fluxes.indices]
+
+    # zero the diagonal without changing the sparsity structure
+    fluxes.data[rows == fluxes.indices] = 0
+    fluxes.eliminate_zeros()
+
+    return fluxes
+
+
+def reactive_fluxes(tprob, sources, sinks, populations=None,
+                    for_committors=None, dtype=None):
     """Computes the total flux along any edge in an MSM from a set of
     sources to sinks.
 
@@ -60,38 +176,46 @@ def reactive_fluxes(tprob, sources, sinks, populations=None):
     populations : array, shape [n_states, ], optional, default: None
         Equilibrium populations of each state. If not provided, will
         recalculate from tprob.
+    for_committors : array, shape [n_states, ], optional, default: None
+        Forward committors for the reaction sources -> sinks. If not
+        provided, will calculate from tprob. The most recently
+        calculated committors are cached, so repeated calls on the
+        same tprob, sources and sinks only solve for them once.
+    dtype : {np.float32, np.float64}, optional, default: None
+        Floating point type of the computed fluxes. If not provided,
+        fluxes are single precision if tprob is, and double precision
+        otherwise. Single precision halves the memory footprint and
+        bandwidth of the flux calculation for large MSMs.
 
     Returns
     -------
-    fluxes : np.ndarray
+    fluxes : np.ndarray or scipy.sparse.csr_matrix
         The flux through each edge in a MSM from a set of sources
-        to sinks
+        to sinks. If `tprob` is sparse, the fluxes are returned as a
+        sparse CSR matrix.
 
     See Also
     --------
     """
 
-    # parse data and obtain relevant parameters
-
-    populations, n_states, forward_committors, reverse_committors = \
-        _get_data_from_tprob(tprob, sources, sinks, populations)
-
     # fij = pi_i * q-_i * Tij * q+_j
+    left, right, dtype = _flux_scaling(
+        tprob, sources, sinks, populations, for_committors, dtype)
+
     if sparse.issparse(tprob):
-        fluxes = tprob.multiply((populations * reverse_committors)[:, None])\
-                      .multiply(forward_committors)
-        fluxes = fluxes.tolil()
+        fluxes = _sparse_reactive_fluxes(tprob, left, right, dtype)
     else:
-        fluxes = \
-            tprob * ((populations * reverse_committors)[:, None]) \
-            * forward_committors
-
-    fluxes[(np.arange(n_states), np.arange(n_states))] = np.zeros(n_states)
+        # the compiled kernel evaluates the whole product, including
+        # zeroing the diagonal, in one thread-parallel pass over tprob
+        tprob = np.ascontiguousarray(tprob, dtype=dtype)
+        fluxes = np.empty_like(tprob)
+        _reactive_fluxes_dense(tprob, left, right, fluxes)
 
     return fluxes
 
 
-def net_fluxes(tprob, sources, sinks, populations=None):
+def net_fluxes(tprob, sources, sinks, populations=None,
+               for_committors=None, dtype=None):
     """Computes the net fluxes along a given edge from a set of sources
     to sinks.
 
@@ -106,26 +230,50 @@ def net_fluxes(tprob, sources, sinks, populations=None):
     populations : array, shape [n_states, ], optional, default: None
         Equilibrium populations of each state. If not provided, will
         recalculate from tprob.
+    for_committors : array, shape [n_states, ], optional, default: None
+        Forward committors for the reaction sources -> sinks. If not
+        provided, will calculate from tprob. The most recently
+        calculated committors are cached, so repeated calls on the
+        same tprob, sources and sinks only solve for them once.
+    dtype : {np.float32, np.float64}, optional, default: None
+        Floating point type of the computed fluxes. If not provided,
+        fluxes are single precision if tprob is, and double precision
+        otherwise.
 
     Returns
     -------
-    net_fluxes : np.ndarray
+    net_fluxes : np.ndarray or scipy.sparse.csr_matrix
         The flux through each edge in a MSM from a set of sources
-        to sinks
+        to sinks. If `tprob` is sparse, the net fluxes are returned as
+        a sparse CSR matrix.
 
     See Also
     --------
     """
-    # calculate the probability flux through each edge
-    fluxes = reactive_fluxes(tprob, sources, sinks, populations=populations)
 
-    # get the net flux along each edge
-    net_fluxes = fluxes - fluxes.T
-    net_fluxes[np.where(net_fluxes < 0)] = 0
+    left, right, dtype = _flux_scaling(
+        tprob, sources, sinks, populations, for_committors, dtype)
+
+    if sparse.issparse(tprob):
+        # calculate the probability flux through each edge
+        fluxes = _sparse_reactive_fluxes(tprob, left, right, dtype)
+
+        # get the net flux along each edge
+        net_fluxes = (fluxes - fluxes.T).tocsr()
+        net_fluxes.data[net_fluxes.data < 0] = 0
+        net_fluxes.eliminate_zeros()
+    else:
+        # the compiled kernel computes the net flux for each pair of
+        # states directly, without allocating the gross fluxes
+        tprob = np.ascontiguousarray(tprob, dtype=dtype)
+        net_fluxes = np.empty_like(tprob)
+        _net_fluxes_dense(tprob, left, right, net_fluxes)
+
     return net_fluxes
 
 
-def reactive_populations(tprob, sources, sinks, populations=None):
+def reactive_populations(tprob, sources, sinks, populations=None,
+                         for_committors=None):
     """Compute the probability that a state is observed on a
     reactive trajectory.
 
@@ -140,6 +288,11 @@ def reactive_populations(tprob, sources, sinks, populations=None):
     populations : array, shape [n_states, ], optional, default: None
         Equilibrium populations of each state. If not provided, will
         recalculate from tprob.
+    for_committors : array, shape [n_states, ], optional, default: None
+        Forward committors for the reaction sources -> sinks. If not
+        provided, will calculate from tprob. The most recently
+        calculated committors are cached, so repeated calls on the
+        same tprob, sources and sinks only solve for them once.
 
     Returns
     -------
@@ -151,7 +304,8 @@ def reactive_populations(tprob, sources, sinks, populations=None):
     """
     # parse data and obtain relevant parameters
     populations, n_states, forward_committors, reverse_committors = \
-        _get_data_from_tprob(tprob, sources, sinks, populations)
+        _get_data_from_tprob(
+            tprob, sources, sinks, populations, for_committors)
 
     # mR_i = pi_i * q+_i * q-_i
     densities = populations * forward_committors * reverse_committors
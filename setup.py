@@ -89,6 +89,11 @@ cython_extensions = [
         ["enspara/msm/libmsm.pyx"],
         extra_compile_args=extra_compile_args,
         extra_link_args=extra_link_args,
+    ), Extension(
+        "enspara.tpt.libtpt",
+        ["enspara/tpt/libtpt.pyx"],
+        extra_compile_args=extra_compile_args,
+        extra_link_args=extra_link_args,
     )]
 
 setup(
@@ -121,7 +126,7 @@ setup(
             'numpydoc>=0.9.1',
         ],
         'mpi': [
-            'mpi4py>=2.0.0'
+            'mpi4py>=3.1'
         ]
     },
     zip_safe=False